@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+from typing import Any
+
+from agent.io import ep_dir
+
+
+def list_episodes(root: Path) -> list[dict[str, Any]]:
+    eps_dir = root / "episodes"
+    if not eps_dir.exists():
+        return []
+    out = []
+    for p in sorted(eps_dir.glob("ep[0-9][0-9][0-9][0-9]")):
+        out.append({"id": p.name, "path": p.relative_to(root).as_posix()})
+    return out
+
+
+def episode_files(root: Path, episode: int) -> list[str]:
+    ep = ep_dir(root, episode)
+    if not ep.exists():
+        raise FileNotFoundError(f"episode not found: {ep}")
+    files = []
+    for p in ep.rglob("*"):
+        if p.is_file():
+            files.append(p.relative_to(root).as_posix())
+    return sorted(files)
+
+
+def shotlist_summary(root: Path, episode: int) -> dict[str, Any]:
+    shotlist = ep_dir(root, episode) / "shotlist.csv"
+    if not shotlist.exists():
+        raise FileNotFoundError(f"shotlist not found: {shotlist}")
+    with shotlist.open("r", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    total = len(rows)
+    video = sum(1 for r in rows if r.get("output_type") == "video")
+    total_sec = sum(int(float(r.get("duration_sec") or 0)) for r in rows)
+    scenes = len({r.get("scene_id") for r in rows if r.get("scene_id")})
+    return {"episode": episode, "shots": total, "video": video, "total_sec": total_sec, "scenes": scenes}
@@ -11,6 +11,7 @@ class ProjectConfig:
     series_bible: dict
     platform: dict
     budget: dict
+    textgen: dict
 
 
 def _load_yaml(path: Path) -> dict:
@@ -24,4 +25,5 @@ def load_project(root: str | Path = Path(".")) -> ProjectConfig:
     series_bible = _load_yaml(root / "specs" / "series_bible.yaml")
     platform = _load_yaml(root / "specs" / "platform" / "douyin.yaml")
     budget = _load_yaml(root / "specs" / "budget.yaml")
-    return ProjectConfig(root=root, series_bible=series_bible, platform=platform, budget=budget)
+    textgen = _load_yaml(root / "specs" / "textgen.yaml")
+    return ProjectConfig(root=root, series_bible=series_bible, platform=platform, budget=budget, textgen=textgen)
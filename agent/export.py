@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from agent import catalog
+
+# Text assets get a pre-compressed ``.gz`` sibling (nginx ``gzip_static``, Caddy ``precompressed``).
+COMPRESSIBLE_SUFFIXES = {".html", ".json", ".jsonl", ".md", ".csv", ".yaml", ".yml", ".txt"}
+
+MANIFEST_PLACEHOLDER = '<meta name="static-manifest" content="" />'
+
+INDEX_TEMPLATE = Path(__file__).resolve().parents[1] / "server" / "static" / "index.html"
+
+# Written into ``out`` by an export into an empty directory; pruning only runs where it exists.
+EXPORT_MARKER = ".static-export"
+
+# Episode files up to this size are hashed and compressed in memory; larger ones are streamed.
+SMALL_FILE_BYTES = 1 << 20
+CHUNK_BYTES = 1 << 16
+
+
+def _hashed_name(rel: str, digest: str) -> str:
+    p = Path(rel)
+    return p.with_name(f"{p.stem}.{digest[:12]}{p.suffix}").as_posix()
+
+
+def _targets(path: Path) -> list[Path]:
+    if path.suffix in COMPRESSIBLE_SUFFIXES:
+        return [path, path.with_name(path.name + ".gz")]
+    return [path]
+
+
+def _write_atomic(target: Path, write: Callable[[BinaryIO], None]) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("wb", delete=False, dir=str(target.parent)) as tf:
+        write(tf)
+        tmp = Path(tf.name)
+    os.chmod(tmp, 0o644)
+    tmp.replace(target)
+
+
+def _publish(out: Path, rel: str, data: bytes) -> None:
+    for target in _targets(out / rel):
+        payload = gzip.compress(data, mtime=0) if target.suffix == ".gz" else data
+        _write_atomic(target, lambda f: f.write(payload))
+
+
+def _publish_file(out: Path, rel: str, src: Path) -> None:
+    def copy(dst: BinaryIO, compress: bool) -> None:
+        with src.open("rb") as fsrc:
+            if compress:
+                with gzip.GzipFile(filename="", mode="wb", fileobj=dst, mtime=0) as gz:
+                    shutil.copyfileobj(fsrc, gz, CHUNK_BYTES)
+            else:
+                shutil.copyfileobj(fsrc, dst, CHUNK_BYTES)
+
+    for target in _targets(out / rel):
+        _write_atomic(target, lambda f: copy(f, target.suffix == ".gz"))
+
+
+def _put(out: Path, rel: str, data: bytes) -> str:
+    """Write ``data`` under a content-hashed name and return its path relative to ``out``."""
+
+    name = _hashed_name(rel, hashlib.sha256(data).hexdigest())
+    if not all(t.exists() for t in _targets(out / name)):
+        _publish(out, name, data)
+    return name
+
+
+def _put_file(out: Path, rel: str, src: Path) -> str:
+    """Like ``_put`` for an on-disk file; large or binary files are hashed and copied in chunks."""
+
+    if src.suffix in COMPRESSIBLE_SUFFIXES and src.stat().st_size <= SMALL_FILE_BYTES:
+        return _put(out, rel, src.read_bytes())
+
+    h = hashlib.sha256()
+    with src.open("rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+            h.update(chunk)
+    name = _hashed_name(rel, h.hexdigest())
+    if not all(t.exists() for t in _targets(out / name)):
+        _publish_file(out, name, src)
+    return name
+
+
+def _put_json(out: Path, rel: str, obj: Any) -> str:
+    return _put(out, rel, json.dumps(obj, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+
+
+def _prune(out: Path, keep: set[str]) -> None:
+    """Remove hashed files from earlier exports that the current manifest no longer references."""
+
+    stale = [p for p in out.glob("manifest.*") if p.is_file()]
+    for sub in ("data", "files"):
+        stale += [p for p in (out / sub).rglob("*") if p.is_file()]
+    for p in stale:
+        if p.relative_to(out).as_posix() not in keep:
+            p.unlink()
+    for sub in ("data", "files"):
+        for d in sorted((out / sub).rglob("*"), key=lambda d: len(d.parts), reverse=True):
+            if d.is_dir() and not any(d.iterdir()):
+                d.rmdir()
+
+
+def export_static(*, root: str | Path, out: str | Path) -> Path:
+    """Pre-build the episode viewer into a static tree under ``out``.
+
+    Every data file is content-hashed, so it can be served with an immutable cache
+    policy; ``index.html`` is written last and is the only entry point that changes
+    between exports. Hashed files left over from earlier exports are pruned afterwards,
+    but only in directories this exporter created (marked with ``.static-export``).
+    """
+
+    root = Path(root).resolve()
+    out = Path(out).resolve()
+    if out == root or out in root.parents:
+        raise ValueError(f"Export directory must not contain the project root: {out}")
+
+    if not out.exists() or not any(out.iterdir()):
+        out.mkdir(parents=True, exist_ok=True)
+        (out / EXPORT_MARKER).write_text("", encoding="utf-8")
+
+    episodes = catalog.list_episodes(root)
+    manifest: dict[str, Any] = {
+        "episodes": _put_json(out, "data/episodes.json", episodes),
+        "episode": {},
+        "files": {},
+    }
+
+    for item in episodes:
+        episode = int(item["id"][2:])
+        files = catalog.episode_files(root, episode)
+        try:
+            summary = catalog.shotlist_summary(root, episode)
+        except FileNotFoundError:
+            summary = None
+        manifest["episode"][str(episode)] = {
+            "files": _put_json(out, f"data/{item['id']}/files.json", files),
+            "summary": _put_json(out, f"data/{item['id']}/summary.json", summary) if summary else None,
+        }
+        for rel in files:
+            manifest["files"][rel] = _put_file(out, f"files/{rel}", root / rel)
+
+    manifest_name = _put_json(out, "manifest.json", manifest)
+
+    html = INDEX_TEMPLATE.read_text(encoding="utf-8")
+    if MANIFEST_PLACEHOLDER not in html:
+        raise ValueError(f"index.html is missing the static manifest placeholder: {MANIFEST_PLACEHOLDER}")
+    html = html.replace(MANIFEST_PLACEHOLDER, f'<meta name="static-manifest" content="{manifest_name}" />')
+    _publish(out, "index.html", html.encode("utf-8"))
+
+    if (out / EXPORT_MARKER).exists():
+        names = {manifest_name, manifest["episodes"], *manifest["files"].values()}
+        for entry in manifest["episode"].values():
+            names.update(v for v in entry.values() if v)
+        keep = {t.relative_to(out).as_posix() for name in names for t in _targets(out / name)}
+        _prune(out, keep)
+    return out / "index.html"
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Callable, Dict, List
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from agent.textgen import GenRequest, TextBackend
 
 
 @dataclass
@@ -10,12 +13,18 @@ class StepContext:
     episode: int
     steps: List[str]
     force: bool = False
+    backend: Optional["TextBackend"] = None
+    # Requests prebuilt by the runner, keyed by step name; None means nothing to generate.
+    requests: Dict[str, Optional["GenRequest"]] = field(default_factory=dict)
 
 
 StepFn = Callable[[StepContext], None]
+# Builds the text-generation request a step will issue, or None if it has nothing to generate.
+RequestFn = Callable[[StepContext], Optional["GenRequest"]]
 
 
 _REGISTRY: Dict[str, StepFn] = {}
+_REQUESTS: Dict[str, RequestFn] = {}
 
 
 def register(name: str):
@@ -26,6 +35,18 @@ def register(name: str):
     return deco
 
 
+def register_request(name: str):
+    def deco(fn: RequestFn) -> RequestFn:
+        _REQUESTS[name] = fn
+        return fn
+
+    return deco
+
+
+def get_request_builder(name: str) -> Optional[RequestFn]:
+    return _REQUESTS.get(name)
+
+
 def get_step(name: str) -> StepFn:
     if name not in _REGISTRY:
         raise KeyError(f"Unknown step: {name}. Available: {', '.join(sorted(_REGISTRY))}")
@@ -2,25 +2,71 @@ from __future__ import annotations
 
 import argparse
 
-from agent.registry import StepContext, get_step, list_steps
+from agent.config import load_project
+from agent.export import export_static
+from agent.registry import StepContext, get_request_builder, get_step, list_steps
+from agent.textgen import get_backend
 
 # Import steps to populate registry
 import agent.steps  # noqa: F401
 
 
 def run_steps(*, root: str, episode: int, steps: list[str], force: bool = False) -> None:
-    ctx = StepContext(root=root, episode=episode, steps=steps, force=force)
+    run_season(root=root, episodes=[episode], steps=steps, force=force)
+
+
+def run_season(
+    *, root: str, episodes: list[int], steps: list[str], force: bool = False, refresh: bool = False
+) -> None:
+    """Run ``steps`` for every episode, one step at a time across the whole season.
+
+    Text-generation requests of a step are built once per episode and prefetched
+    together, so the shared backend can batch them before the step runs per episode.
+    ``refresh`` bypasses cached generations (new results are still cached).
+    """
+
+    # Only steps with a request builder generate text; don't require a backend config otherwise.
+    needs_text = any(get_request_builder(name) is not None for name in steps)
+    backend = get_backend(load_project(root), refresh=refresh) if needs_text else None
+    ctxs = [StepContext(root=root, episode=ep, steps=steps, force=force, backend=backend) for ep in episodes]
     for name in steps:
         fn = get_step(name)
-        fn(ctx)
+        build = get_request_builder(name)
+        if build is not None:
+            for ctx in ctxs:
+                ctx.requests[name] = build(ctx)
+            reqs = [ctx.requests[name] for ctx in ctxs if ctx.requests[name] is not None]
+            if reqs:
+                backend.prefetch(reqs)
+        for ctx in ctxs:
+            fn(ctx)
+
+
+def _parse_episodes(spec: str) -> list[int]:
+    out: list[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = (int(x) for x in part.split("-", 1))
+            out.extend(range(lo, hi + 1))
+        else:
+            out.append(int(part))
+    return sorted(set(out))
 
 
 def main() -> None:
     p = argparse.ArgumentParser(prog="drama-agent")
-    p.add_argument("command", choices=["run", "steps"], help="Run pipeline or list steps")
+    p.add_argument("command", choices=["run", "steps", "export"], help="Run pipeline, list steps or export static viewer")
     p.add_argument("--root", default=".")
     p.add_argument("--episode", type=int, default=1)
+    p.add_argument("--episodes", help="Episode list/ranges for a batched run, e.g. '1-100' or '1,3,5-8'")
     p.add_argument("--force", action="store_true", help="Overwrite existing outputs")
+    p.add_argument(
+        "--refresh", action="store_true", help="Ignore cached text generations (use with --force to resample)"
+    )
+    p.add_argument("--out", default="dist/static", help="Output directory for 'export'")
     p.add_argument(
         "--steps",
         default="outline,script,shotlist,package",
@@ -34,8 +80,14 @@ def main() -> None:
             print(s)
         return
 
+    if args.command == "export":
+        index = export_static(root=args.root, out=args.out)
+        print(f"OK: export -> {index}")
+        return
+
     steps = [s.strip() for s in args.steps.split(",") if s.strip()]
-    run_steps(root=args.root, episode=args.episode, steps=steps, force=args.force)
+    episodes = _parse_episodes(args.episodes) if args.episodes else [args.episode]
+    run_season(root=args.root, episodes=episodes, steps=steps, force=args.force, refresh=args.refresh)
     for name in steps:
         print(f"OK: {name}")
 
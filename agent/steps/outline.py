@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 from agent.config import load_project
 from agent.io import atomic_write, ep_dir
-from agent.registry import StepContext, register
+from agent.registry import StepContext, register, register_request
+from agent.textgen import GenRequest, generate_step_text
 
 import yaml
 
@@ -13,53 +16,59 @@ def _load_yaml(path):
     return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
 
 
-@register("outline")
-def run_outline(ctx: StepContext) -> None:
-    """Generate a deterministic episode outline from series bible + episode brief."""
+def _char_label(bible: dict, cid: str) -> str:
+    for c in (bible.get("characters", []) or []):
+        if c.get("id") == cid and c.get("name"):
+            return f"{cid}（{c['name']}）"
+    return cid
+
 
+def _prompt(bible: dict, c: dict) -> str:
+    meta = bible.get("meta", {}) or {}
+    lines = [
+        f"你是短剧编剧。请为{meta.get('series_title', '本剧')}第{c['episode']}集写分集大纲，输出 Markdown。",
+        f"系列梗概：{meta.get('logline', '')}",
+        f"本集工作标题：{c['title']}",
+        f"本集目的：{c['purpose'] or '推进主线并制造代价'}",
+        f"必要角色：{', '.join(_char_label(bible, cid) for cid in c['characters']) or '（未指定）'}",
+        f"必要地点：{', '.join(c['locations']) or '（未指定）'}",
+        "必须覆盖的关键点：",
+        *[f"- {p}" for p in c["plot_points"]],
+        "结构节拍（每个节拍一个二级标题，写明目标与推进）：",
+        *[f"- {b.get('beat', '')} ({b.get('minutes', '')})：{b.get('goal', '')}" for b in c["beats"]],
+        f"格式：以“# EP{c['episode']:04d} 大纲：{c['title']}”开头，包含“## 必要元素”和“## 结构节拍”。",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+@register_request("outline")
+def outline_request(ctx: StepContext) -> GenRequest | None:
     project = load_project(ctx.root)
     ep = ep_dir(project.root, ctx.episode)
-
-    out_path = ep / "outline.md"
-    if out_path.exists() and not ctx.force:
-        return
+    if (ep / "outline.md").exists() and not ctx.force:
+        return None
 
     brief = _load_yaml(ep / "brief.yaml")
     bible = project.series_bible
-
-    beats = (bible.get("format", {}) or {}).get("episode_beats", []) or []
-    title = brief.get("title_working") or f"EP{ctx.episode:04d}"
-    purpose = brief.get("purpose") or ""
     req = brief.get("required", {}) or {}
 
-    chars = req.get("characters", []) or []
-    locs = req.get("locations", []) or []
-    plot_points = (req.get("plot_points", []) or [])
-
-    def beat_section(b):
-        name = b.get("beat", "")
-        minutes = b.get("minutes", "")
-        goal = b.get("goal", "")
-        bullets = [
-            f"- 当集目标推进：{purpose or '推进主线并制造代价'}",
-            f"- 必须覆盖：{'; '.join(plot_points) if plot_points else '（待补充）'}",
-            f"- 角色：{', '.join(chars) if chars else '（待补充）'}；地点：{', '.join(locs) if locs else '（待补充）'}",
-        ]
-        return f"## {name} ({minutes})\n- 目标：{goal}\n" + "\n".join(bullets) + "\n"
-
-    content = [f"# EP{ctx.episode:04d} 大纲：{title}\n", f"**Purpose**：{purpose}\n" if purpose else "", "\n## 必要元素\n"]
-    if chars:
-        content.append(f"- 角色：{', '.join(chars)}\n")
-    if locs:
-        content.append(f"- 地点：{', '.join(locs)}\n")
-    if plot_points:
-        content.append("- 关键点：\n" + "\n".join([f"  - {p}" for p in plot_points]) + "\n")
-
-    content.append("\n## 结构节拍\n")
-    if beats:
-        for b in beats:
-            content.append(beat_section(b) + "\n")
-    else:
-        content.append("- （未在 specs/series_bible.yaml 中找到 episode_beats）\n")
-
-    atomic_write(out_path, "".join(content))
+    context = {
+        "episode": ctx.episode,
+        "title": brief.get("title_working") or f"EP{ctx.episode:04d}",
+        "purpose": brief.get("purpose") or "",
+        "characters": req.get("characters", []) or [],
+        "locations": req.get("locations", []) or [],
+        "plot_points": req.get("plot_points", []) or [],
+        "beats": (bible.get("format", {}) or {}).get("episode_beats", []) or [],
+    }
+    return GenRequest(task="outline", prompt=_prompt(bible, context), context=context)
+
+
+@register("outline")
+def run_outline(ctx: StepContext) -> None:
+    """Generate the episode outline from series bible + episode brief via the configured text backend."""
+
+    text = generate_step_text(ctx, "outline", outline_request)
+    if text is None:
+        return
+    atomic_write(ep_dir(Path(ctx.root), ctx.episode) / "outline.md", text)
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+from pathlib import Path
+
 from agent.config import load_project
 from agent.io import atomic_write, ep_dir
-from agent.registry import StepContext, register
+from agent.registry import StepContext, register, register_request
+from agent.textgen import GenRequest, generate_step_text
 
 import yaml
 
@@ -20,62 +23,52 @@ def _char_name(bible: dict, cid: str) -> str:
     return cid
 
 
-@register("script")
-def run_script(ctx: StepContext) -> None:
-    """Generate a deterministic scene-based script scaffold."""
+def _prompt(bible: dict, c: dict, outline: str) -> str:
+    meta = bible.get("meta", {}) or {}
+    beats = (bible.get("format", {}) or {}).get("episode_beats", []) or []
+    lines = [
+        f"你是短剧编剧。请为{meta.get('series_title', '本剧')}第{c['episode']}集写分场剧本，输出 Markdown。",
+        f"本集工作标题：{c['title']}",
+        f"本集目的：{c['purpose'] or '推进主线并制造代价'}",
+        f"角色：{', '.join(f'{cid}={name}' for cid, name in c['names'].items()) or '（未指定）'}",
+        "场景与节拍一一对应：",
+        *[f"- SC{i:02d} {b.get('beat', '')}：{b.get('goal', '')}" for i, b in enumerate(beats, 1)],
+        "每场格式：“## SCxx 地点·时间（节拍）”，一行“- 动作：…”，随后每句台词一行“- 角色（情绪）：台词”。",
+        f"以“# EP{c['episode']:04d} 剧本：{c['title']}”开头。",
+    ]
+    if outline:
+        lines += ["", "本集大纲：", outline.strip()]
+    return "\n".join(lines) + "\n"
+
 
+@register_request("script")
+def script_request(ctx: StepContext) -> GenRequest | None:
     project = load_project(ctx.root)
     ep = ep_dir(project.root, ctx.episode)
-
-    out_path = ep / "script.md"
-    if out_path.exists() and not ctx.force:
-        return
+    if (ep / "script.md").exists() and not ctx.force:
+        return None
 
     brief = _load_yaml(ep / "brief.yaml")
     bible = project.series_bible
-
-    title = brief.get("title_working") or f"EP{ctx.episode:04d}"
-    purpose = brief.get("purpose") or ""
     req = brief.get("required", {}) or {}
     cids = req.get("characters", []) or []
 
-    names = {cid: _char_name(bible, cid) for cid in cids}
-
-    scenes = [
-        ("SC01", "外门院·清晨", "hook", [
-            (names.get("C2", "反派"), "冷笑", "来，废柴，示范一下什么叫不配。"),
-            (names.get("C1", "主角"), "压着怒", "我只求考核资格。"),
-        ]),
-        ("SC02", "管事处·白天", "setup", [
-            ("管事", "敷衍", "名册上没你。"),
-            (names.get("C1", "主角"), "克制", "我昨日的贡献——"),
-        ]),
-        ("SC03", "藏经阁外·夜", "escalation_1", [
-            ("执事", "冷", "想学？先去后山废井，把遗失法器取回。"),
-            (names.get("C2", "反派"), "假惺惺", "他只是想看看门规。"),
-        ]),
-        ("SC04", "后山废井口·夜", "mid_turn", [
-            (names.get("C1", "主角"), "喘息", "……别掉下去。"),
-            ("仙箓", "浮现", "以命换路，以弱破局。"),
-        ]),
-        ("SC05", "废井深处·夜", "escalation_2", [
-            (names.get("C1", "主角"), "咬牙", "我不会按你们写好的结局走。"),
-        ]),
-        ("SC06", "外门院·深夜", "cliffhanger", [
-            (names.get("C2", "反派"), "命令", "东西给我。"),
-            (names.get("C1", "主角"), "第一次不退", "不。"),
-        ]),
-    ]
+    context = {
+        "episode": ctx.episode,
+        "title": brief.get("title_working") or f"EP{ctx.episode:04d}",
+        "purpose": brief.get("purpose") or "",
+        "names": {cid: _char_name(bible, cid) for cid in cids},
+    }
+    outline_path = ep / "outline.md"
+    outline = outline_path.read_text(encoding="utf-8") if outline_path.exists() else ""
+    return GenRequest(task="script", prompt=_prompt(bible, context, outline), context=context)
 
-    lines = [f"# EP{ctx.episode:04d} 剧本：{title}\n\n"]
-    if purpose:
-        lines.append(f"**Purpose**：{purpose}\n\n")
 
-    for sid, loc, beat, dialog in scenes:
-        lines.append(f"## {sid} {loc}（{beat}）\n")
-        lines.append("- 动作：按镜头表实现（近景为主、快切）。\n")
-        for who, emo, text in dialog:
-            lines.append(f"- {who}（{emo}）：{text}\n")
-        lines.append("\n")
+@register("script")
+def run_script(ctx: StepContext) -> None:
+    """Generate the scene-based script via the configured text backend."""
 
-    atomic_write(out_path, "".join(lines))
+    text = generate_step_text(ctx, "script", script_request)
+    if text is None:
+        return
+    atomic_write(ep_dir(Path(ctx.root), ctx.episode) / "script.md", text)
@@ -0,0 +1,52 @@
+"""Pluggable text generation for the outline/script steps.
+
+Backends are selected by ``specs/textgen.yaml`` (``backend: template | http``).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from agent.config import ProjectConfig, load_project
+from agent.registry import RequestFn, StepContext
+
+
+@dataclass(frozen=True)
+class GenRequest:
+    task: str
+    prompt: str
+    # Structured inputs for the template backend; never sent over HTTP or used as a cache key.
+    context: dict[str, Any] = field(default_factory=dict, compare=False)
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+class TextBackend:
+    def generate(self, requests: list[GenRequest]) -> list[str]:
+        raise NotImplementedError
+
+    def prefetch(self, requests: list[GenRequest]) -> None:
+        """Warm the backend for requests that ``generate`` will be asked for next."""
+
+
+def get_backend(project: ProjectConfig, *, refresh: bool = False) -> TextBackend:
+    cfg = project.textgen or {}
+    name = cfg.get("backend", "template")
+    if name == "template":
+        from agent.textgen.template import TemplateBackend
+
+        return TemplateBackend()
+    if name == "http":
+        from agent.textgen.http import HttpBackend
+
+        return HttpBackend.from_config(project.root, cfg, refresh=refresh)
+    raise ValueError(f"Unknown textgen backend: {name}. Available: http, template")
+
+
+def generate_step_text(ctx: StepContext, name: str, build: RequestFn) -> str | None:
+    """Generate the text for step ``name``, reusing the runner's prebuilt request and backend."""
+
+    req = ctx.requests[name] if name in ctx.requests else build(ctx)
+    if req is None:
+        return None
+    backend = ctx.backend or get_backend(load_project(ctx.root))
+    return backend.generate([req])[0]
@@ -0,0 +1,151 @@
+"""HTTP text-generation backend with batching, bounded concurrency and a persistent cache.
+
+Wire protocol (also served by ``agent.textgen.stub_server``)::
+
+    POST <url>  {"model": str, "requests": [{"prompt": str, "params": {...}}, ...]}
+    200         {"outputs": [str, ...]}   # same order and length as "requests"
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from agent.io import atomic_write
+from agent.textgen import GenRequest, TextBackend
+
+
+class ResponseCache:
+    """One JSON file per generation, keyed by sha256 of model + prompt + params."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    @staticmethod
+    def key(model: str, prompt: str, params: dict[str, Any]) -> str:
+        material = json.dumps({"model": model, "prompt": prompt, "params": params}, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))["text"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, truncated or corrupt entry: treat as a miss; the new output overwrites it.
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        atomic_write(self._path(key), json.dumps({"key": key, "text": text}, ensure_ascii=False))
+
+
+class HttpBackend(TextBackend):
+    def __init__(
+        self,
+        *,
+        url: str,
+        model: str = "",
+        params: dict[str, Any] | None = None,
+        cache: ResponseCache | None = None,
+        batch_size: int = 8,
+        max_concurrency: int = 4,
+        timeout_sec: float = 120.0,
+        api_key: str | None = None,
+        refresh: bool = False,
+    ):
+        self.url = url
+        self.model = model
+        self.params = dict(params or {})
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout_sec = timeout_sec
+        self.api_key = api_key
+        self.refresh = refresh
+        # Outputs produced or loaded during this process, so prefetch + generate never POST twice.
+        self._memo: dict[str, str] = {}
+
+    @classmethod
+    def from_config(cls, root: Path, cfg: dict, *, refresh: bool = False) -> "HttpBackend":
+        http = cfg.get("http", {}) or {}
+        if not http.get("url"):
+            raise ValueError("specs/textgen.yaml: http.url is required for the http backend")
+        cache_dir = http.get("cache_dir", ".cache/textgen")
+        key_env = http.get("api_key_env")
+        return cls(
+            url=http["url"],
+            model=http.get("model", ""),
+            params=cfg.get("params", {}) or {},
+            cache=ResponseCache(root / cache_dir) if cache_dir else None,
+            batch_size=int(http.get("batch_size", 8)),
+            max_concurrency=int(http.get("max_concurrency", 4)),
+            timeout_sec=float(http.get("timeout_sec", 120)),
+            api_key=os.environ.get(key_env) if key_env else None,
+            refresh=refresh or bool(http.get("refresh", False)),
+        )
+
+    def _params(self, req: GenRequest) -> dict[str, Any]:
+        return {**self.params, **req.params}
+
+    def _post(self, batch: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        body = {"model": self.model, "requests": [{"prompt": p, "params": params} for p, params in batch]}
+        headers = {"content-type": "application/json"}
+        if self.api_key:
+            headers["authorization"] = f"Bearer {self.api_key}"
+        http_req = urllib.request.Request(
+            self.url, data=json.dumps(body, ensure_ascii=False).encode("utf-8"), headers=headers, method="POST"
+        )
+        with urllib.request.urlopen(http_req, timeout=self.timeout_sec) as res:
+            payload = json.loads(res.read().decode("utf-8"))
+        outputs = payload.get("outputs") if isinstance(payload, dict) else None
+        if not isinstance(outputs, list) or len(outputs) != len(batch):
+            raise ValueError(f"textgen server returned {len(outputs or [])} outputs for {len(batch)} requests")
+        return [str(o) for o in outputs]
+
+    def generate(self, requests: list[GenRequest]) -> list[str]:
+        keys = []
+        results: dict[str, str] = {}
+        pending: dict[str, tuple[str, dict[str, Any]]] = {}
+        for req in requests:
+            params = self._params(req)
+            key = ResponseCache.key(self.model, req.prompt, params)
+            keys.append(key)
+            if key in results or key in pending:
+                continue
+            if key in self._memo:
+                results[key] = self._memo[key]
+                continue
+            cached = self.cache.get(key) if self.cache and not self.refresh else None
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = (req.prompt, params)
+
+        todo = list(pending.items())
+        batches = [todo[i : i + self.batch_size] for i in range(0, len(todo), self.batch_size)]
+
+        def run(batch: list[tuple[str, tuple[str, dict[str, Any]]]]) -> None:
+            outputs = self._post([item for _, item in batch])
+            for (key, _), text in zip(batch, outputs):
+                if self.cache:
+                    self.cache.put(key, text)
+                results[key] = text
+                self._memo[key] = text
+
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+                # list() re-raises the first failed batch; completed batches are already cached.
+                list(pool.map(run, batches))
+
+        for key in keys:
+            self._memo.setdefault(key, results[key])
+        return [results[k] for k in keys]
+
+    def prefetch(self, requests: list[GenRequest]) -> None:
+        self.generate(requests)
@@ -0,0 +1,92 @@
+"""Local stub for the HTTP textgen protocol (see ``agent.textgen.http``).
+
+Returns deterministic markdown derived from each prompt, so pipelines and caching can be
+exercised without a model::
+
+    python -m agent.textgen.stub_server --port 8765
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def stub_output(model: str, prompt: str, params: dict) -> str:
+    digest = hashlib.sha256(json.dumps([model, prompt, params], ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    first = prompt.strip().splitlines()[0] if prompt.strip() else ""
+    return f"# STUB {digest.hexdigest()[:12]}\n\n{first}\n"
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int]):
+        super().__init__(address, _Handler)
+        self.lock = threading.Lock()
+        self.stats = {"batches": 0, "requests": 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1/generate"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def _send(self, code: int, obj: dict) -> None:
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path != "/stats":
+            self._send(404, {"detail": "not found"})
+            return
+        with self.server.lock:
+            self._send(200, dict(self.server.stats))
+
+    def do_POST(self) -> None:
+        if self.path != "/v1/generate":
+            self._send(404, {"detail": "not found"})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("content-length") or 0)) or b"{}")
+        model = body.get("model", "")
+        items = body.get("requests", []) or []
+        with self.server.lock:
+            self.server.stats["batches"] += 1
+            self.server.stats["requests"] += len(items)
+        outputs = [stub_output(model, it.get("prompt", ""), it.get("params", {}) or {}) for it in items]
+        self._send(200, {"outputs": outputs})
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - silence per-request logging
+        pass
+
+
+def serve_in_thread(host: str = "127.0.0.1", port: int = 0) -> StubServer:
+    """Start a stub server on a background thread; call ``shutdown()`` when done."""
+
+    server = StubServer((host, port))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(prog="textgen-stub")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    args = p.parse_args()
+
+    server = StubServer((args.host, args.port))
+    print(f"textgen stub listening on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict
+
+from agent.textgen import GenRequest, TextBackend
+
+
+def render_outline(c: dict[str, Any]) -> str:
+    """Deterministic episode outline from series bible beats + episode brief."""
+
+    episode = c["episode"]
+    title = c["title"]
+    purpose = c["purpose"]
+    chars = c["characters"]
+    locs = c["locations"]
+    plot_points = c["plot_points"]
+    beats = c["beats"]
+
+    def beat_section(b):
+        name = b.get("beat", "")
+        minutes = b.get("minutes", "")
+        goal = b.get("goal", "")
+        bullets = [
+            f"- 当集目标推进：{purpose or '推进主线并制造代价'}",
+            f"- 必须覆盖：{'; '.join(plot_points) if plot_points else '（待补充）'}",
+            f"- 角色：{', '.join(chars) if chars else '（待补充）'}；地点：{', '.join(locs) if locs else '（待补充）'}",
+        ]
+        return f"## {name} ({minutes})\n- 目标：{goal}\n" + "\n".join(bullets) + "\n"
+
+    content = [f"# EP{episode:04d} 大纲：{title}\n", f"**Purpose**：{purpose}\n" if purpose else "", "\n## 必要元素\n"]
+    if chars:
+        content.append(f"- 角色：{', '.join(chars)}\n")
+    if locs:
+        content.append(f"- 地点：{', '.join(locs)}\n")
+    if plot_points:
+        content.append("- 关键点：\n" + "\n".join([f"  - {p}" for p in plot_points]) + "\n")
+
+    content.append("\n## 结构节拍\n")
+    if beats:
+        for b in beats:
+            content.append(beat_section(b) + "\n")
+    else:
+        content.append("- （未在 specs/series_bible.yaml 中找到 episode_beats）\n")
+
+    return "".join(content)
+
+
+def render_script(c: dict[str, Any]) -> str:
+    """Deterministic scene-based script scaffold."""
+
+    episode = c["episode"]
+    title = c["title"]
+    purpose = c["purpose"]
+    names = c["names"]
+
+    scenes = [
+        ("SC01", "外门院·清晨", "hook", [
+            (names.get("C2", "反派"), "冷笑", "来，废柴，示范一下什么叫不配。"),
+            (names.get("C1", "主角"), "压着怒", "我只求考核资格。"),
+        ]),
+        ("SC02", "管事处·白天", "setup", [
+            ("管事", "敷衍", "名册上没你。"),
+            (names.get("C1", "主角"), "克制", "我昨日的贡献——"),
+        ]),
+        ("SC03", "藏经阁外·夜", "escalation_1", [
+            ("执事", "冷", "想学？先去后山废井，把遗失法器取回。"),
+            (names.get("C2", "反派"), "假惺惺", "他只是想看看门规。"),
+        ]),
+        ("SC04", "后山废井口·夜", "mid_turn", [
+            (names.get("C1", "主角"), "喘息", "……别掉下去。"),
+            ("仙箓", "浮现", "以命换路，以弱破局。"),
+        ]),
+        ("SC05", "废井深处·夜", "escalation_2", [
+            (names.get("C1", "主角"), "咬牙", "我不会按你们写好的结局走。"),
+        ]),
+        ("SC06", "外门院·深夜", "cliffhanger", [
+            (names.get("C2", "反派"), "命令", "东西给我。"),
+            (names.get("C1", "主角"), "第一次不退", "不。"),
+        ]),
+    ]
+
+    lines = [f"# EP{episode:04d} 剧本：{title}\n\n"]
+    if purpose:
+        lines.append(f"**Purpose**：{purpose}\n\n")
+
+    for sid, loc, beat, dialog in scenes:
+        lines.append(f"## {sid} {loc}（{beat}）\n")
+        lines.append("- 动作：按镜头表实现（近景为主、快切）。\n")
+        for who, emo, text in dialog:
+            lines.append(f"- {who}（{emo}）：{text}\n")
+        lines.append("\n")
+
+    return "".join(lines)
+
+
+_RENDERERS: Dict[str, Callable[[dict[str, Any]], str]] = {
+    "outline": render_outline,
+    "script": render_script,
+}
+
+
+class TemplateBackend(TextBackend):
+    """Rule-based backend: renders from ``GenRequest.context`` and ignores the prompt."""
+
+    def generate(self, requests: list[GenRequest]) -> list[str]:
+        out = []
+        for req in requests:
+            if req.task not in _RENDERERS:
+                raise KeyError(f"Unknown template task: {req.task}. Available: {', '.join(sorted(_RENDERERS))}")
+            out.append(_RENDERERS[req.task](req.context))
+        return out
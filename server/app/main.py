@@ -10,6 +10,7 @@ from fastapi.responses import HTMLResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from agent import catalog
 from agent.runner import run_steps
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -48,13 +49,7 @@ def status() -> dict[str, Any]:
 
 @app.get("/api/episodes")
 def list_episodes() -> list[dict[str, Any]]:
-    eps_dir = ROOT / "episodes"
-    if not eps_dir.exists():
-        return []
-    out = []
-    for p in sorted(eps_dir.glob("ep[0-9][0-9][0-9][0-9]")):
-        out.append({"id": p.name, "path": str(p.relative_to(ROOT))})
-    return out
+    return catalog.list_episodes(ROOT)
 
 
 class GenerateReq(BaseModel):
@@ -73,14 +68,10 @@ def generate_episode(episode: int, req: GenerateReq) -> dict[str, Any]:
 
 @app.get("/api/episodes/{episode}/files")
 def episode_files(episode: int) -> list[str]:
-    ep_dir = ROOT / "episodes" / f"ep{episode:04d}"
-    if not ep_dir.exists():
+    try:
+        return catalog.episode_files(ROOT, episode)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="episode not found")
-    files = []
-    for p in ep_dir.rglob("*"):
-        if p.is_file():
-            files.append(str(p.relative_to(ROOT)))
-    return sorted(files)
 
 
 @app.get("/api/file")
@@ -100,15 +91,7 @@ def read_file(path: str) -> PlainTextResponse:
 
 @app.get("/api/shotlist/summary")
 def shotlist_summary(episode: int) -> dict[str, Any]:
-    import csv
-
-    shotlist = ROOT / "episodes" / f"ep{episode:04d}" / "shotlist.csv"
-    if not shotlist.exists():
+    try:
+        return catalog.shotlist_summary(ROOT, episode)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="shotlist not found")
-    with shotlist.open("r", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    total = len(rows)
-    video = sum(1 for r in rows if r.get("output_type") == "video")
-    total_sec = sum(int(float(r.get("duration_sec") or 0)) for r in rows)
-    scenes = len({r.get("scene_id") for r in rows if r.get("scene_id")})
-    return {"episode": episode, "shots": total, "video": video, "total_sec": total_sec, "scenes": scenes}
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+from agent import export
+from agent.export import EXPORT_MARKER, export_static
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    root = tmp_path / "project"
+    shutil.copytree(REPO / "episodes", root / "episodes")
+    # A binary asset whose own name ends in .gz must survive pruning.
+    (root / "episodes" / "ep0001" / "delivery" / "clip.gz").write_bytes(gzip.compress(b"clip", mtime=0))
+    return root
+
+
+def _manifest(out: Path) -> dict:
+    html = (out / "index.html").read_text(encoding="utf-8")
+    name = re.search(r'<meta name="static-manifest" content="([^"]+)" />', html).group(1)
+    return json.loads((out / name).read_text(encoding="utf-8"))
+
+
+def _manifest_paths(m: dict) -> list[str]:
+    paths = [m["episodes"], *m["files"].values()]
+    for entry in m["episode"].values():
+        paths += [v for v in entry.values() if v]
+    return paths
+
+
+def _tree(out: Path) -> set[str]:
+    return {p.relative_to(out).as_posix() for p in out.rglob("*") if p.is_file()}
+
+
+def test_manifest_paths_exist_and_gz_siblings_match(project: Path, tmp_path: Path):
+    out = tmp_path / "out"
+    export_static(root=project, out=out)
+
+    m = _manifest(out)
+    assert "episodes/ep0001/delivery/clip.gz" in m["files"]
+    for rel in _manifest_paths(m):
+        assert (out / rel).is_file(), rel
+        gz = out / (rel + ".gz")
+        if Path(rel).suffix in export.COMPRESSIBLE_SUFFIXES:
+            assert gzip.decompress(gz.read_bytes()) == (out / rel).read_bytes()
+        else:
+            assert not gz.exists()
+
+
+def test_index_html_references_manifest(project: Path, tmp_path: Path):
+    out = tmp_path / "out"
+    export_static(root=project, out=out)
+
+    html = (out / "index.html").read_text(encoding="utf-8")
+    assert export.MANIFEST_PLACEHOLDER not in html
+    name = re.search(r'content="(manifest\.[0-9a-f]{12}\.json)"', html).group(1)
+    assert (out / name).is_file()
+
+
+def test_reexport_prunes_only_stale_files(project: Path, tmp_path: Path):
+    out = tmp_path / "out"
+    export_static(root=project, out=out)
+    before = _tree(out)
+    old_outline = _manifest(out)["files"]["episodes/ep0001/outline.md"]
+
+    with (project / "episodes" / "ep0001" / "outline.md").open("a", encoding="utf-8") as f:
+        f.write("\n- 追加\n")
+    export_static(root=project, out=out)
+    after = _tree(out)
+    new_outline = _manifest(out)["files"]["episodes/ep0001/outline.md"]
+
+    removed = before - after
+    assert {old_outline, old_outline + ".gz"} <= removed
+    # Everything else removed is superseded index data (manifest, file listing), never an episode asset.
+    assert all(not r.startswith("files/") for r in removed - {old_outline, old_outline + ".gz"})
+    assert {new_outline, new_outline + ".gz"} <= after
+    assert len(after) == len(before)
+
+
+def test_large_files_are_streamed(project: Path, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(export, "SMALL_FILE_BYTES", 16)
+    out = tmp_path / "out"
+    export_static(root=project, out=out)
+
+    m = _manifest(out)
+    rel = m["files"]["episodes/ep0001/shotlist.csv"]
+    src = (project / "episodes" / "ep0001" / "shotlist.csv").read_bytes()
+    assert (out / rel).read_bytes() == src
+    assert gzip.decompress((out / (rel + ".gz")).read_bytes()) == src
+
+
+def test_no_prune_in_foreign_directory(project: Path, tmp_path: Path):
+    out = tmp_path / "site"
+    (out / "files").mkdir(parents=True)
+    (out / "files" / "keep.txt").write_text("user file", encoding="utf-8")
+    (out / "manifest.old.json").write_text("{}", encoding="utf-8")
+
+    export_static(root=project, out=out)
+    assert not (out / EXPORT_MARKER).exists()
+    assert (out / "files" / "keep.txt").exists()
+    assert (out / "manifest.old.json").exists()
+
+
+def test_refuses_out_containing_root(project: Path):
+    with pytest.raises(ValueError):
+        export_static(root=project, out=project)
+    with pytest.raises(ValueError):
+        export_static(root=project, out=project.parent)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import io
+import json
+import shutil
+import urllib.request
+from pathlib import Path
+
+import pytest
+import yaml
+
+from agent.runner import run_season
+from agent.textgen import GenRequest
+from agent.textgen.http import HttpBackend
+from agent.textgen.stub_server import serve_in_thread
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    shutil.copytree(REPO / "specs", tmp_path / "specs")
+    (tmp_path / "episodes" / "ep0001").mkdir(parents=True)
+    shutil.copy(REPO / "episodes" / "ep0001" / "brief.yaml", tmp_path / "episodes" / "ep0001" / "brief.yaml")
+    return tmp_path
+
+
+@pytest.fixture
+def stub():
+    server = serve_in_thread()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _stats(server) -> dict:
+    with urllib.request.urlopen(server.url.replace("/v1/generate", "/stats")) as res:
+        return json.loads(res.read())
+
+
+def _use_http(root: Path, server, *, model: str = "stub", params: dict | None = None, **http) -> None:
+    path = root / "specs" / "textgen.yaml"
+    cfg = yaml.safe_load(path.read_text(encoding="utf-8"))
+    cfg["backend"] = "http"
+    cfg["http"].update(url=server.url, model=model, **http)
+    if params is not None:
+        cfg["params"] = params
+    path.write_text(yaml.safe_dump(cfg, allow_unicode=True), encoding="utf-8")
+
+
+def _season(root: Path, **kw) -> None:
+    run_season(root=str(root), episodes=list(range(1, 11)), steps=["outline", "script"], force=True, **kw)
+
+
+def test_template_backend_matches_committed_episode(project: Path):
+    run_season(root=str(project), episodes=[1], steps=["outline", "script"], force=True)
+    for name in ("outline.md", "script.md"):
+        expected = (REPO / "episodes" / "ep0001" / name).read_bytes()
+        assert (project / "episodes" / "ep0001" / name).read_bytes() == expected
+
+
+@pytest.mark.parametrize("cache_dir", [".cache/textgen", ""])
+def test_http_batches_across_episodes(project: Path, stub, cache_dir: str):
+    _use_http(project, stub, batch_size=4, cache_dir=cache_dir)
+    _season(project)
+    # 10 outlines + 10 scripts, 4 prompts per POST -> 3 batches per step.
+    assert _stats(stub) == {"batches": 6, "requests": 20}
+    assert (project / "episodes" / "ep0002" / "script.md").read_text(encoding="utf-8").startswith("# STUB ")
+
+
+def test_http_cache_skips_unchanged_and_refetches_changed(project: Path, stub):
+    _use_http(project, stub, batch_size=4, params={"temperature": 0.7})
+    _season(project)
+    assert _stats(stub)["requests"] == 20
+
+    _season(project)
+    assert _stats(stub)["requests"] == 20
+
+    _use_http(project, stub, batch_size=4, params={"temperature": 0.9})
+    _season(project)
+    assert _stats(stub)["requests"] == 40
+
+    _use_http(project, stub, batch_size=4, params={"temperature": 0.9}, model="stub-2")
+    _season(project)
+    assert _stats(stub)["requests"] == 60
+
+    _season(project, refresh=True)
+    assert _stats(stub)["requests"] == 80
+
+
+def test_http_cache_treats_corrupt_entry_as_miss(project: Path, stub):
+    _use_http(project, stub, batch_size=4)
+    run_season(root=str(project), episodes=[1], steps=["outline"], force=True)
+    entry = next((project / ".cache" / "textgen").rglob("*.json"))
+    entry.write_text('{"key": "trunc', encoding="utf-8")
+
+    run_season(root=str(project), episodes=[1], steps=["outline"], force=True)
+    assert _stats(stub)["requests"] == 2
+    assert json.loads(entry.read_text(encoding="utf-8"))["text"].startswith("# STUB ")
+
+
+def test_steps_without_text_do_not_need_backend_config(project: Path):
+    path = project / "specs" / "textgen.yaml"
+    path.write_text(yaml.safe_dump({"backend": "http", "http": {}}), encoding="utf-8")
+    run_season(root=str(project), episodes=[1], steps=["shotlist", "package"], force=True)
+    assert (project / "episodes" / "ep0001" / "prompts" / "video_tasks.jsonl").exists()
+
+
+@pytest.mark.parametrize("body", [b"[]", b'"upstream error"', b'{"outputs": "x"}', b'{"outputs": []}'])
+def test_http_rejects_malformed_response(monkeypatch, body: bytes):
+    class _Res(io.BytesIO):
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(urllib.request, "urlopen", lambda *a, **kw: _Res(body))
+    backend = HttpBackend(url="http://stub.invalid/v1/generate")
+    with pytest.raises(ValueError, match="textgen server returned"):
+        backend.generate([GenRequest(task="outline", prompt="p")])